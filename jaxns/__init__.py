@@ -1,6 +1,95 @@
 """Nested sampling with JAX."""
 
-from jaxns.framework import *
-from jaxns.plotting import *
-from jaxns.public import *
-from jaxns.utils import *
+import importlib
+
+# Public names are imported lazily on first access (PEP 562), so that `import jaxns` doesn't pay for importing JAX,
+# tensorflow_probability, haiku, etc. until they are needed.
+_LAZY_IMPORTS = {
+    # jaxns.framework
+    'Model': 'jaxns.framework',
+    'Prior': 'jaxns.framework',
+    'InvalidPriorName': 'jaxns.framework',
+    'Bernoulli': 'jaxns.framework',
+    'Beta': 'jaxns.framework',
+    'Categorical': 'jaxns.framework',
+    'ForcedIdentifiability': 'jaxns.framework',
+    'Poisson': 'jaxns.framework',
+    'UnnormalisedDirichlet': 'jaxns.framework',
+    'Empirical': 'jaxns.framework',
+    'TruncationWrapper': 'jaxns.framework',
+    'jaxify_likelihood': 'jaxns.framework',
+    'PriorModelGen': 'jaxns.framework',
+    'PriorModelType': 'jaxns.framework',
+    # jaxns.plotting
+    'plot_diagnostics': 'jaxns.plotting',
+    'plot_cornerplot': 'jaxns.plotting',
+    # jaxns.public
+    'DefaultNestedSampler': 'jaxns.public',
+    'ApproximateNestedSampler': 'jaxns.public',
+    'ExactNestedSampler': 'jaxns.public',
+    'TerminationCondition': 'jaxns.public',
+    # jaxns.utils
+    'resample': 'jaxns.utils',
+    'marginalise_static_from_U': 'jaxns.utils',
+    'marginalise_dynamic_from_U': 'jaxns.utils',
+    'marginalise_static': 'jaxns.utils',
+    'marginalise_dynamic': 'jaxns.utils',
+    'maximum_a_posteriori_point': 'jaxns.utils',
+    'evaluate_map_estimate': 'jaxns.utils',
+    'summary': 'jaxns.utils',
+    'analytic_posterior_samples': 'jaxns.utils',
+    'sample_evidence': 'jaxns.utils',
+    'bruteforce_posterior_samples': 'jaxns.utils',
+    'bruteforce_evidence': 'jaxns.utils',
+    'save_pytree': 'jaxns.utils',
+    'save_results': 'jaxns.utils',
+    'load_pytree': 'jaxns.utils',
+    'load_results': 'jaxns.utils',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+# Subpackages and modules, so that e.g. `import jaxns; jaxns.utils` works without an explicit `import jaxns.utils`.
+_LAZY_SUBMODULES = {
+    'experimental',
+    'framework',
+    'internals',
+    'nested_sampler',
+    'plotting',
+    'public',
+    'samplers',
+    'utils',
+    'warnings',
+}
+
+# Modules of jaxns.framework, which the old `from jaxns.framework import *` exposed at the top level,
+# e.g. `jaxns.special_priors`.
+_LAZY_FRAMEWORK_SUBMODULES = {
+    'abc',
+    'bases',
+    'jaxify',
+    'model',
+    'ops',
+    'prior',
+    'special_priors',
+    'wrapped_tfp_distribution',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value  # Subsequent lookups don't go through __getattr__
+        return value
+    if name in _LAZY_SUBMODULES:
+        # Importing a submodule binds it as an attribute of this package
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _LAZY_FRAMEWORK_SUBMODULES:
+        value = importlib.import_module(f'{__name__}.framework.{name}')
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _LAZY_SUBMODULES | _LAZY_FRAMEWORK_SUBMODULES)
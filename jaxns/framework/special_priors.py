@@ -4,12 +4,11 @@ from typing import Tuple, Union, Optional, Literal
 import jax
 import numpy as np
 import tensorflow_probability.substrates.jax as tfp
-from jax import numpy as jnp, vmap, lax
+from jax import numpy as jnp, lax
 from jax._src.scipy.special import gammaln
 
 from jaxns.framework.bases import BaseAbstractPrior
 from jaxns.framework.prior import SingularPrior, prior_to_parametrised_singular
-from jaxns.internals.log_semiring import cumulative_logsumexp
 from jaxns.internals.types import FloatArray, IntArray, BoolArray, float_type, int_type, UType, RandomVariableType, \
     MeasureType
 
@@ -43,9 +42,18 @@ class SpecialPrior(BaseAbstractPrior):
 
 
 class Bernoulli(SpecialPrior):
-    def __init__(self, *, logits=None, probs=None, name: Optional[str] = None):
+    def __init__(self, *, logits=None, probs=None, dtype=jnp.int32, name: Optional[str] = None):
+        """
+        Initialised Bernoulli special prior.
+
+        Args:
+            logits: log-odds of a 1 event
+            probs: probability of a 1 event
+            dtype: dtype of samples, e.g. `jnp.uint8` or `jnp.bool_` use a quarter of the memory of int32
+            name: optional name
+        """
         super(Bernoulli, self).__init__(name=name)
-        self.dist = tfpd.Bernoulli(logits=logits, probs=probs)
+        self.dist = tfpd.Bernoulli(logits=logits, probs=probs, dtype=dtype)
 
     def _dtype(self):
         return self.dist.dtype
@@ -71,20 +79,40 @@ class Bernoulli(SpecialPrior):
         return sample.astype(self.dtype)
 
 
+def _all_ones(x) -> bool:
+    """
+    Check if a concrete value is all ones, i.e. can be decided at trace time. Tracers are never all ones.
+    """
+    if x is None or isinstance(x, jax.core.Tracer):
+        return False
+    return bool(np.all(np.asarray(x) == 1))
+
+
 class Beta(SpecialPrior):
     def __init__(self, *, concentration0=None, concentration1=None, name: Optional[str] = None):
         super(Beta, self).__init__(name=name)
-        # Special cases for Beta that are faster use the Kumaraswamy distribution
-        if isinstance(concentration0, (float, int)) and concentration0 == 1:
-            self.dist = tfpd.Kumaraswamy(concentration0=concentration0, concentration1=concentration1)
-        elif isinstance(concentration1, (float, int)) and concentration1 == 1:
-            self.dist = tfpd.Kumaraswamy(concentration0=concentration0, concentration1=concentration1)
-        elif isinstance(concentration0, np.ndarray) and np.all(concentration0 == 1):
-            self.dist = tfpd.Kumaraswamy(concentration0=concentration0, concentration1=concentration1)
-        elif isinstance(concentration1, np.ndarray) and np.all(concentration1 == 1):
-            self.dist = tfpd.Kumaraswamy(concentration0=concentration0, concentration1=concentration1)
+        self._concentration0 = concentration0
+        self._concentration1 = concentration1
+        # Special cases for Beta that are faster use the Kumaraswamy distribution, and have closed form quantiles:
+        # 1 if concentration0 == 1, 2 if concentration1 == 1, else 0.
+        if _all_ones(concentration0):
+            self._fast = 1
+        elif _all_ones(concentration1):
+            self._fast = 2
         else:
-            self.dist = tfpd.Beta(concentration0=concentration0, concentration1=concentration1)
+            self._fast = 0
+        self._dist = None
+
+    @property
+    def dist(self):
+        # Built on first use, so that constructing many priors doesn't construct many distributions.
+        if self._dist is None:
+            if self._fast != 0:
+                self._dist = tfpd.Kumaraswamy(concentration0=self._concentration0,
+                                              concentration1=self._concentration1)
+            else:
+                self._dist = tfpd.Beta(concentration0=self._concentration0, concentration1=self._concentration1)
+        return self._dist
 
     def _dtype(self):
         return self.dist.dtype
@@ -105,7 +133,17 @@ class Beta(SpecialPrior):
         return self.dist.log_prob(X)
 
     def _quantile(self, U):
-        X = self.dist.quantile(U)
+        concentration1 = jnp.asarray(self._concentration1, self.dtype)
+        concentration0 = jnp.asarray(self._concentration0, self.dtype)
+        if self._fast == 1:
+            # Beta(concentration1, 1) has CDF x^concentration1
+            return (U ** (1. / concentration1)).astype(self.dtype)
+        elif self._fast == 2:
+            # Beta(1, concentration0) has CDF 1 - (1 - x)^concentration0
+            return (1. - (1. - U) ** (1. / concentration0)).astype(self.dtype)
+        # Directly invert the regularised incomplete beta function, skipping the distribution's checks and broadcasting.
+        # Kumaraswamy is only used in the cases above, so no closed form is needed for it here.
+        X = tfp.math.betaincinv(concentration1, concentration0, U.astype(self.dtype))
         return X.astype(self.dtype)
 
 
@@ -125,6 +163,10 @@ class Categorical(SpecialPrior):
         super(Categorical, self).__init__(name=name)
         self.dist = tfpd.Categorical(logits=logits, probs=probs)
         self._parametrisation = parametrisation
+        # Computed once, rather than on every transform
+        self._logits = self.dist._logits_parameter_no_checks()  # [..., N]
+        if self._parametrisation == 'cdf':
+            self._cum_logits = _normalized_cum_logprobs(self._logits)  # [..., N]
 
     def _dtype(self):
         return self.dist.dtype
@@ -153,17 +195,16 @@ class Categorical(SpecialPrior):
         return self.dist.log_prob(X)
 
     def _quantile_gumbelmax(self, U):
-        logits = self.dist._logits_parameter_no_checks()
+        logits = self._logits
         sample_dtype = self.dtype
         z = -jnp.log(-jnp.log(U))  # gumbel
-        draws = jnp.argmax(logits + z, axis=-1).astype(sample_dtype)
+        # top_k with k=1 lowers to a dedicated reduction kernel, which is faster than argmax for large K
+        _, draws = lax.top_k(logits + z, k=1)
+        draws = draws[..., 0].astype(sample_dtype)
         return draws
 
     def _cdf_gumbelmax(self, X):
-        logits = self.dist._logits_parameter_no_checks()
-        z = jnp.max(logits, axis=-1, keepdims=True)
-        logits -= z
-        return jnp.exp(logits) / jnp.sum(jnp.exp(logits), axis=-1, keepdims=True)
+        return jax.nn.softmax(self._logits, axis=-1)
 
     def _quantile_cdf(self, U):
         """
@@ -175,18 +216,42 @@ class Categorical(SpecialPrior):
         Returns:
             [...]
         """
-        logits = self.dist._logits_parameter_no_checks()  # [..., N]
-        cum_logits = cumulative_logsumexp(logits, axis=-1)  # [..., N]
-        cum_logits -= cum_logits[..., -1:]
+        cum_logits = self._cum_logits  # [..., N]
         N = cum_logits.shape[-1]
-        cum_logits_flat = jnp.reshape(cum_logits, (-1, N))
-        log_U_flat = jnp.reshape(jnp.log(U), (-1,))
-
-        category_flat = vmap(lambda a, v: jnp.searchsorted(a, v, side='left'))(cum_logits_flat, log_U_flat)
-        category = jnp.reshape(category_flat, U.shape)
+        log_U = jnp.log(U)  # [...]
+
+        # Batched branchless bisection, equivalent to searchsorted(cum_logits, log_U, side='left') on each row.
+        def body(i, state):
+            (lo, hi) = state
+            mid = (lo + hi) // 2
+            take = jnp.take_along_axis(cum_logits, mid[..., None], axis=-1, mode='clip')[..., 0]
+            cond = take < log_U
+            lo = jnp.where(cond, mid + 1, lo)
+            hi = jnp.where(cond, hi, mid)
+            return (lo, hi)
+
+        lo = jnp.zeros(U.shape, jnp.int32)
+        hi = jnp.full(U.shape, N, jnp.int32)
+        # Interval width halves each step, so bit_length(N) steps reduce it to zero.
+        category, _ = lax.fori_loop(0, N.bit_length(), body, (lo, hi))
         return category
 
 
+def _normalized_cum_logprobs(logits):
+    """
+    Normalised cumulative log-probabilities in a single pass over the category axis.
+
+    Args:
+        logits: [..., N] logits
+
+    Returns:
+        [..., N] log of the cumulative probabilities, with the last element zero
+    """
+    m = jnp.max(logits, axis=-1, keepdims=True)
+    cs = jnp.cumsum(jnp.exp(logits - m), axis=-1)
+    return jnp.log(cs) - jnp.log(cs[..., -1:])
+
+
 class ForcedIdentifiability(SpecialPrior):
     """
     Prior for a sequence of `n` random variables uniformly distributed on U[low, high] such that U[i,...] <= U[i+1,...].
@@ -207,7 +272,8 @@ class ForcedIdentifiability(SpecialPrior):
         if n < n_min:
             raise ValueError(f'`n` too small for fix_left={fix_left} and fix_right={fix_right}')
         self.n = n
-        low, high = jnp.broadcast_arrays(low, high)
+        # Only the shape is broadcast, the arrays broadcast when used.
+        self._bcast_shape = jnp.broadcast_shapes(jnp.shape(low), jnp.shape(high))
         self.low = low
         self.high = high
         self.fix_left = fix_left
@@ -222,10 +288,10 @@ class ForcedIdentifiability(SpecialPrior):
             num_base -= 1
         if self.fix_right:
             num_base -= 1
-        return (num_base,) + np.shape(self.low)
+        return (num_base,) + self._bcast_shape
 
     def _shape(self) -> Tuple[int, ...]:
-        return (self.n,) + np.shape(self.low)
+        return (self.n,) + self._bcast_shape
 
     def _forward(self, U) -> Union[FloatArray, IntArray, BoolArray]:
         return self._quantile(U)
@@ -272,33 +338,38 @@ class ForcedIdentifiability(SpecialPrior):
         return U.astype(self.dtype)
 
     def _quantile(self, U):
-        n = self.n
-        if self.fix_left:
-            n -= 1
-        if self.fix_right:
-            n -= 1
-        log_x = jnp.log(U)  # [n, ...]
-        k = jnp.arange(n) + 1
-        inner = log_x / lax.reshape(k, (n,) + (1,) * (len(self.shape) - 1))
-        log_output = jnp.cumsum(inner[::-1], axis=0)[::-1]
-        output = self.low + (self.high - self.low) * jnp.exp(log_output)
-        if self.fix_left:
-            output = jnp.concatenate([self.low[None], output], axis=0)
-        if self.fix_right:
-            output = jnp.concatenate([output, self.high[None]], axis=0)
-        return output.astype(self.dtype)
-
-
-def _poisson_quantile_bisection(U, rate, max_iter=15, unroll: bool = True):
-    # max_iter is set so that error < 1 up to rate of 1e4
+        return _forced_identifiability_quantile(U, self.low, self.high, self.n, self.shape, self.fix_left,
+                                                self.fix_right)
+
+
+@partial(jax.jit, static_argnums=(3, 4, 5, 6))
+def _forced_identifiability_quantile(U, low, high, n: int, shape: Tuple[int, ...], fix_left: bool, fix_right: bool):
+    # n and shape are static, so k is constant folded into the compiled graph.
+    if fix_left:
+        n -= 1
+    if fix_right:
+        n -= 1
+    log_x = jnp.log(U)  # [n, ...]
+    k = jnp.arange(n) + 1
+    inner = log_x / lax.reshape(k, (n,) + (1,) * (len(shape) - 1))
+    # Reverse cumulative sum as a parallel prefix sum, O(log n) depth. Not computed as total - cumsum + inner, which is
+    # nan when U contains 0.
+    log_output = lax.associative_scan(jnp.add, inner, reverse=True, axis=0)
+    output = low + (high - low) * jnp.exp(log_output)
+    if fix_left:
+        output = jnp.concatenate([jnp.broadcast_to(low, shape[1:])[None], output], axis=0)
+    if fix_right:
+        output = jnp.concatenate([output, jnp.broadcast_to(high, shape[1:])[None]], axis=0)
+    return output.astype(float_type)
+
+
+def _poisson_quantile_bisection(U, rate, max_iter=10, unroll: bool = True):
+    # max_iter halves the initial bracket of width 8 sqrt(rate) to below 1 for rates up to 1e4. Bisection is only used
+    # for rates above 1e4 though, where the error is dominated by float32 precision of igammac (e.g. ~40 at 1e5, ~1e3
+    # at 1e6) rather than by max_iter, so more iterations don't help.
+    # All elements are bisected simultaneously, broadcasting U against rate.
     rate = jnp.maximum(jnp.asarray(rate), 1e-5)
-    if np.size(rate) > 1:
-        raise ValueError("Rate must be a scalar")
-
-    if np.size(U) > 1:
-        U_flat = U.ravel()
-        x_final, x_results = vmap(lambda u: _poisson_quantile_bisection(u, rate, max_iter, unroll))(U_flat)
-        return x_final.reshape(U.shape), x_results.reshape(U.shape + (max_iter,))
+    U = jnp.asarray(U)
 
     def smooth_cdf(x, rate):
         return lax.igammac(x + 1., rate)
@@ -331,9 +402,17 @@ def _poisson_quantile_bisection(U, rate, max_iter=15, unroll: bool = True):
 
         return new_x, 0.5 * (a + b)
 
-    a = jnp.asarray(0.)
-    b = jnp.asarray(rate)
-    f_a = jnp.asarray(0.)
+    # Warm start with a bracket around the normal approximation of the quantile
+    z = jnp.minimum(jax.scipy.special.ndtri(U), 8.)
+    sqrt_rate = jnp.sqrt(rate)
+    x0 = rate + sqrt_rate * z
+    a = jnp.maximum(0., x0 - 4. * sqrt_rate)
+    b = jnp.maximum(1., x0 + 4. * sqrt_rate)  # positive so that doubling can extend it
+    f_a = smooth_cdf(a, rate)
+    # In case the approximation is poor, fall back to a = 0. If b doesn't bound then it's doubled during iteration.
+    left_of_a = f_a > U
+    a = jnp.where(left_of_a, 0., a)
+    f_a = jnp.where(left_of_a, 0., f_a)
     f_b = smooth_cdf(b, rate)
     init = (a, b, f_a, f_b)
 
@@ -347,12 +426,124 @@ def _poisson_quantile_bisection(U, rate, max_iter=15, unroll: bool = True):
 
     c = 0.5 * (a + b)
 
-    return c, x_results
+    return c, jnp.moveaxis(x_results, 0, -1)
+
+
+def _poisson_quantile_newton(U, rate, max_iter=6, unroll: bool = True):
+    # Safeguarded Newton iteration, starting from the Cornish-Fisher approximation of the quantile.
+    rate = jnp.maximum(jnp.asarray(rate), 1e-5)
+    U = jnp.asarray(U)
+
+    def smooth_cdf(x, rate):
+        return lax.igammac(x + 1., rate)
+
+    def smooth_pmf(x, rate):
+        # Approximates d/dx smooth_cdf without another igammac evaluation
+        return jnp.exp(x * jnp.log(rate) - rate - lax.lgamma(x + 1.))
+
+    def newton_update(x, args):
+        (x, a, b) = x
+
+        f_x = smooth_cdf(x, rate) - U
+        df_x = smooth_pmf(x, rate)
+
+        below = f_x < 0.
+        a = jnp.where(below, x, a)
+        b = jnp.where(below, b, x)
+
+        # Bisect whenever the Newton step leaves the bracket
+        x_newton = x - f_x / df_x
+        accept = (x_newton >= a) & (x_newton <= b) & (df_x > 0.)
+        x = jnp.where(accept, x_newton, 0.5 * (a + b))
+
+        new_x = (x, a, b)
+
+        return new_x, x
+
+    z = jnp.clip(jax.scipy.special.ndtri(U), -8., 8.)
+    sqrt_rate = jnp.sqrt(rate)
+    a = jnp.zeros(jnp.broadcast_shapes(jnp.shape(U), jnp.shape(rate)))
+    b = a + rate + 10. * sqrt_rate + 10.
+    x = jnp.clip(rate + sqrt_rate * z + (z ** 2 - 1.) / 6. - 0.5, a, b)
+    init = (x, a, b)
+
+    (x, a, b), x_results = lax.scan(
+        newton_update,
+        init,
+        jnp.arange(max_iter),
+        unroll=max_iter if unroll else 1
+    )
+
+    return x, jnp.moveaxis(x_results, 0, -1)
+
+
+def _poisson_quantile_sequential(U, rate):
+    # Inversion by sequential search in log-space, see `Poisson._quantile`. Cheap for small rates as the number of
+    # iterations is about rate + sqrt(rate), and igamma is only needed to refine the upper tail.
+    rate = jnp.maximum(jnp.asarray(rate), 1e-5)
+    log_U = jnp.log(U)
+    log_rate = jnp.log(rate)
+    # Stops the search when U is so close to 1 that the cumulative sum can't reach it in finite precision
+    log_x_max = jnp.log(rate + 10. * jnp.sqrt(rate) + 10.)
+    shape = jnp.broadcast_shapes(jnp.shape(U), jnp.shape(rate))
+
+    def searching(state):
+        (log_x, log_p, log_s) = state
+        return (log_U > log_s) & (log_x < log_x_max)
+
+    def cond(state):
+        return jnp.any(searching(state))
+
+    def body(state):
+        (log_x, log_p, log_s) = state
+        log_x1 = jnp.logaddexp(log_x, 0.)
+        log_p1 = log_p + log_rate - log_x1
+        log_s1 = jnp.logaddexp(log_s, log_p1)
+        done = jnp.bitwise_not(searching(state))
+        log_x = jnp.where(done, log_x, log_x1)
+        log_p = jnp.where(done, log_p, log_p1)
+        log_s = jnp.where(done, log_s, log_s1)
+        return (log_x, log_p, log_s)
+
+    log_p = jnp.broadcast_to(-rate, shape)
+    init = (jnp.full(shape, -jnp.inf), log_p, log_p)
+    (log_x, _, _) = lax.while_loop(cond, body, init)
+    x = jnp.round(jnp.exp(log_x))
+
+    # The running sum loses precision as it approaches 1, so in the upper tail the search can stop a few steps early
+    # (or one late). There the quantile is refined with the survival function, P(X > k) = igamma(k + 1, rate), which is
+    # accurate in the tail and is compared against 1 - U, which is exact for U > 0.5.
+    upper = jnp.broadcast_to(U > 0.5, shape)
+    sf_U = 1. - U
+    rate = jnp.broadcast_to(rate, shape)
+    x_max = jnp.exp(log_x_max)
+
+    def below(x):
+        return upper & (lax.igamma(x + 1., rate) > sf_U) & (x < x_max)
+
+    x = jnp.where(upper & (x > 0.) & (lax.igamma(jnp.maximum(x, 1.), rate) <= sf_U), x - 1., x)
+    x = lax.while_loop(lambda x: jnp.any(below(x)), lambda x: jnp.where(below(x), x + 1., x), x)
+    return x
 
 
 @partial(jax.jit, static_argnames=("unroll",))
 def _poisson_quantile(U, rate, unroll: bool = False):
-    x, _ = _poisson_quantile_bisection(U, rate, unroll=unroll)
+    def root_finding():
+        # Newton needs fewer igammac evaluations, but bisection is kept for very large rates
+        x = lax.cond(
+            jnp.any(rate > 1e4),
+            lambda: _poisson_quantile_bisection(U, rate, unroll=unroll)[0],
+            lambda: _poisson_quantile_newton(U, rate, unroll=unroll)[0]
+        )
+        # The root of the smooth CDF lies in (k-1, k] for the quantile k, i.e. the smallest k with CDF(k) >= U.
+        k = jnp.floor(x)
+        return jnp.where(lax.igammac(k + 1., jnp.maximum(rate, 1e-5)) < U, k + 1., k)
+
+    x = lax.cond(
+        jnp.all(rate < 30.),
+        lambda: _poisson_quantile_sequential(U, rate),
+        root_finding
+    )
     return x.astype(int_type)
 
 
@@ -395,8 +586,6 @@ class Poisson(SpecialPrior):
                 return exp(log_x).
         """
         rate = self.dist.rate_parameter()
-        if np.size(rate) > 1:
-            return jax.vmap(lambda u, r: _poisson_quantile(u, r))(U.ravel(), rate.ravel()).reshape(self.shape)
         return _poisson_quantile(U, rate)
 
 
@@ -6,12 +6,14 @@ import numpy as np
 import pytest
 import tensorflow_probability.substrates.jax as tfp
 from jax import random, numpy as jnp, vmap
+from scipy.stats import poisson
 
 from jaxns.framework.bases import PriorModelGen, BaseAbstractPrior
 from jaxns.framework.ops import parse_prior, prepare_input, compute_log_likelihood
 from jaxns.framework.prior import Prior, InvalidPriorName
 from jaxns.framework.special_priors import Bernoulli, Categorical, Poisson, Beta, ForcedIdentifiability, \
-    UnnormalisedDirichlet, _poisson_quantile_bisection, _poisson_quantile, Empirical, TruncationWrapper
+    UnnormalisedDirichlet, _poisson_quantile_bisection, _poisson_quantile_newton, _poisson_quantile_sequential, \
+    _poisson_quantile, Empirical, TruncationWrapper
 from jaxns.framework.wrapped_tfp_distribution import InvalidDistribution, distribution_chain
 from jaxns.internals.types import float_type
 
@@ -259,6 +261,15 @@ def test_poisson_quantile_bisection(rate, error):
     assert jnp.all(diff_last_two <= error)
 
 
+@pytest.mark.parametrize("rate", [2.0, 10., 100., 1000., 10000.])
+def test_poisson_quantile_newton(rate):
+    U = jnp.linspace(0.01, 0.99, 99)
+    x, x_results = _poisson_quantile_newton(U, rate, unroll=False)
+    x_bisection, _ = _poisson_quantile_bisection(U, rate, unroll=False)
+    assert x_results.shape == U.shape + (6,)
+    np.testing.assert_allclose(x, x_bisection, atol=2.)
+
+
 @pytest.mark.parametrize("rate", [2.0, 10., 100., 1000., 10000.])
 def test_poisson_quantile(rate):
     U = jnp.linspace(0., 1. - np.spacing(1.), 10000)
@@ -266,6 +277,64 @@ def test_poisson_quantile(rate):
     assert jnp.all(jnp.isfinite(x))
 
 
+@pytest.mark.parametrize("rate, atol", [(30., 0.), (31., 0.), (100., 0.), (1000., 1.)])
+def test_poisson_quantile_scipy(rate, atol):
+    # Root-finding regime (rate >= 30), compared against scipy's quantile
+    U = jnp.linspace(0.01, 0.99, 99)
+    x = _poisson_quantile(U, rate)
+    np.testing.assert_allclose(x, poisson.ppf(np.asarray(U, np.float64), rate), rtol=0., atol=atol)
+
+
+def test_categorical_quantile_cdf():
+    logits = jax.random.normal(jax.random.PRNGKey(42), shape=(3, 7))
+    prior = Categorical(parametrisation='cdf', logits=logits, name='x')
+    U = jax.random.uniform(jax.random.PRNGKey(43), shape=(3,))
+    cum_logits = jnp.log(jnp.cumsum(jax.nn.softmax(logits, axis=-1), axis=-1))
+    expected = vmap(lambda a, v: jnp.searchsorted(a, v, side='left'))(cum_logits, jnp.log(U))
+    assert jnp.all(prior.forward(U) == expected)
+
+
+def test_bernoulli_dtype():
+    U = jax.random.uniform(jax.random.PRNGKey(42), shape=(13,))
+    probs = jnp.linspace(0., 1., 13)
+    prior = Bernoulli(probs=probs, dtype=jnp.uint8, name='x')
+    x = prior.forward(U)
+    assert x.dtype == jnp.uint8
+    np.testing.assert_array_equal(x, Bernoulli(probs=probs, name='x').forward(U))
+    # Default matches tfp, independent of x64
+    assert Bernoulli(probs=probs, name='x').dtype == jnp.int32
+
+
+@pytest.mark.parametrize("rate", [0.5, 2.0, 10., 29.])
+def test_poisson_quantile_sequential(rate):
+    # Including the upper tail, where the running sum loses precision
+    U = jnp.concatenate([jnp.linspace(0.01, 0.99, 99), 1. - jnp.logspace(-7, -4, 50)])
+    x = _poisson_quantile_sequential(U, rate)
+    np.testing.assert_array_equal(x, poisson.ppf(np.asarray(U, np.float64), rate))
+
+
+def test_poisson_quantile_batched_rate():
+    rate = jnp.asarray([2., 10., 100., 1000.])
+    prior = Poisson(rate=rate, name='x')
+    U = jnp.asarray([0.1, 0.5, 0.7, 0.9])
+    x = prior.forward(U)
+    assert x.shape == (4,)
+    for i in range(4):
+        assert x[i] == _poisson_quantile(U[i], rate[i])
+
+
+@pytest.mark.parametrize("concentration0, concentration1", [
+    (1., 2.5), (2.5, 1.), (1., 1.), (2.5, 0.5),
+    (1., [2., 3.]), ([2., 3.], 1.), ([1., 1.], [2., 3.]), ([2.5, 1.], [0.5, 2.]),
+    (jnp.ones(2), jnp.asarray([2., 3.])), (np.asarray([2., 3.]), np.ones(2))
+])
+def test_beta_quantile(concentration0, concentration1):
+    prior = Beta(concentration0=concentration0, concentration1=concentration1, name='x')
+    U = jnp.linspace(0., 1., 11)[:, None] * jnp.ones(prior.base_shape)  # [11, ...]
+    expected = tfpd.Beta(concentration0=concentration0, concentration1=concentration1).quantile(U)
+    np.testing.assert_allclose(vmap(prior.forward)(U), expected, atol=1e-5)
+
+
 def test_forced_identifiability():
     x = jnp.asarray([0., 0.1, 0.2, 1.])
     prior = ForcedIdentifiability(n=4, low=0., high=1., name='x')
@@ -21,7 +21,7 @@ class InvalidDistribution(Exception):
     def __init__(self, dist: Optional[tfpd.Distribution] = None):
         super(InvalidDistribution, self).__init__(
             f'Distribution {dist} is missing a quantile. '
-            f'Try checking if your desired prior exists in `jaxns.special_priors`.')
+            f'Try checking if your desired prior exists in `jaxns.framework.special_priors`.')
 
 
 def distribution_chain(dist: tfpd.Distribution) -> List[
@@ -1,8 +1,19 @@
+import base64
 import importlib
+from functools import lru_cache
 
 import numpy as np
 
 
+@lru_cache(maxsize=1024)
+def _is_namedtuple_type(cls) -> bool:
+    """
+    Check if the type object is a namedtuple type, by scanning its MRO once per class.
+    """
+    base_types = cls.__mro__  # Get the method resolution order of the class
+    return any(hasattr(base, '_fields') and hasattr(base, '_asdict') for base in base_types)
+
+
 def isinstance_namedtuple(obj) -> bool:
     """
     Check if object is a namedtuple.
@@ -13,59 +24,93 @@ def isinstance_namedtuple(obj) -> bool:
     Returns:
         bool
     """
-    return (
-            isinstance(obj, tuple) and
-            hasattr(obj, '_asdict') and
-            hasattr(obj, '_fields')
-    )
+    return isinstance(obj, tuple) and _is_namedtuple_type(type(obj))
 
 
 def issubclass_namedtuple(cls):
     """
     Check if the type object is a subclass of a namedtuple.
     """
-    base_types = cls.__mro__  # Get the method resolution order of the class
-    return any(hasattr(base, '_fields') and hasattr(base, '_asdict') for base in base_types)
+    return _is_namedtuple_type(cls)
 
 
 def serialise_namedtuple(obj):
-    if isinstance_namedtuple(obj):
-        class_name = f"{obj.__class__.__module__}.{obj.__class__.__name__}"
-        return {'type': '__namedtuple__', '__class__': class_name,
-                '__data__': {k: serialise_namedtuple(v) for k, v in obj._asdict().items()}}
-    elif isinstance(obj, np.ndarray):
-        return serialise_ndarray(obj)
-    elif isinstance(obj, (list, tuple)):
-        return [serialise_namedtuple(v) for v in obj]
-    elif isinstance(obj, dict):
-        return {k: serialise_namedtuple(v) for k, v in obj.items()}
-    else:
-        return obj
+    # Iterative depth-first traversal, each work item places its result into `parent[key]`.
+    root = [None]
+    stack = [(root, 0, obj)]
+    while stack:
+        parent, key, obj = stack.pop()
+        if isinstance_namedtuple(obj):
+            class_name = f"{obj.__class__.__module__}.{obj.__class__.__name__}"
+            items = obj._asdict()
+            data = dict.fromkeys(items)  # preserves field order
+            parent[key] = {'type': '__namedtuple__', '__class__': class_name, '__data__': data}
+            stack.extend((data, k, v) for k, v in items.items())
+        elif isinstance(obj, np.ndarray):
+            parent[key] = serialise_ndarray(obj)
+        elif isinstance(obj, (list, tuple)):
+            output = [None] * len(obj)
+            parent[key] = output
+            stack.extend((output, i, v) for i, v in enumerate(obj))
+        elif isinstance(obj, dict):
+            output = dict.fromkeys(obj)
+            parent[key] = output
+            stack.extend((output, k, v) for k, v in obj.items())
+        else:
+            parent[key] = obj
+    return root[0]
 
 
 def deserialise_namedtuple(obj):
-    if isinstance(obj, dict) and 'type' in obj and obj['type'] == '__namedtuple__':
-        class_path = obj['__class__']
-        module_name, class_name = class_path.rsplit('.', 1)
-        module = importlib.import_module(module_name)
-        class_ = getattr(module, class_name)
-        return class_(**{k: deserialise_namedtuple(v) for k, v in obj['__data__'].items()})
-    elif isinstance(obj, dict) and 'type' in obj and obj['type'] == '__ndarray__':
-        return deserialise_ndarray(obj)
-    elif isinstance(obj, (list, tuple)):
-        return [deserialise_namedtuple(v) for v in obj]
-    elif isinstance(obj, dict):
-        return {k: deserialise_namedtuple(v) for k, v in obj.items()}
-    return obj
+    # Iterative post-order traversal. Namedtuples are immutable, so they're constructed by a work item that is pushed
+    # before (and hence popped after) their fields.
+    root = [None]
+    stack = [(False, root, 0, obj)]
+    while stack:
+        construct, parent, key, obj = stack.pop()
+        if construct:
+            class_, data = obj
+            parent[key] = class_(**data)
+        elif isinstance(obj, dict) and 'type' in obj and obj['type'] == '__namedtuple__':
+            class_path = obj['__class__']
+            module_name, class_name = class_path.rsplit('.', 1)
+            module = importlib.import_module(module_name)
+            class_ = getattr(module, class_name)
+            data = dict.fromkeys(obj['__data__'])
+            stack.append((True, parent, key, (class_, data)))
+            stack.extend((False, data, k, v) for k, v in obj['__data__'].items())
+        elif isinstance(obj, dict) and 'type' in obj and obj['type'] == '__ndarray__':
+            parent[key] = deserialise_ndarray(obj)
+        elif isinstance(obj, (list, tuple)):
+            output = [None] * len(obj)
+            parent[key] = output
+            stack.extend((False, output, i, v) for i, v in enumerate(obj))
+        elif isinstance(obj, dict):
+            output = dict.fromkeys(obj)
+            parent[key] = output
+            stack.extend((False, output, k, v) for k, v in obj.items())
+        else:
+            parent[key] = obj
+    return root[0]
 
 
 def serialise_ndarray(obj):
     if isinstance(obj, np.ndarray):
-        return {'type': '__ndarray__', '__dtype__': str(obj.dtype), '__data__': obj.tolist()}
+        if obj.dtype.hasobject:
+            # Python objects have no raw buffer representation
+            return {'type': '__ndarray__', '__dtype__': str(obj.dtype), '__data__': obj.tolist()}
+        # Raw buffer as base64 avoids boxing every element into a Python object.
+        return {'type': '__ndarray__', '__dtype__': obj.dtype.str, '__shape__': list(obj.shape),
+                '__data__': base64.b64encode(np.ascontiguousarray(obj).tobytes()).decode('ascii')}
     return obj
 
 
 def deserialise_ndarray(obj):
     if isinstance(obj, dict) and obj.get('type') == '__ndarray__':
-        return np.array(obj['__data__'], dtype=obj['__dtype__'])
+        if '__shape__' not in obj:
+            # Legacy (and object dtype) nested list format
+            return np.array(obj['__data__'], dtype=obj['__dtype__'])
+        data = np.frombuffer(base64.b64decode(obj['__data__']), dtype=obj['__dtype__'])
+        # frombuffer is read-only, so copy to get a normal writable array
+        return data.reshape(tuple(obj['__shape__'])).copy()
     return obj
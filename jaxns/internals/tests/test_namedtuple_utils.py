@@ -3,7 +3,8 @@ from typing import NamedTuple
 
 import numpy as np
 
-from jaxns.internals.namedtuple_utils import issubclass_namedtuple, serialise_namedtuple, deserialise_namedtuple
+from jaxns.internals.namedtuple_utils import issubclass_namedtuple, serialise_namedtuple, deserialise_namedtuple, \
+    serialise_ndarray, deserialise_ndarray
 
 
 # Example NamedTuple
@@ -17,6 +18,11 @@ class MockPerson(NamedTuple):
     age: MockAge
 
 
+class MockNode(NamedTuple):
+    value: int
+    children: list
+
+
 def test_isinstance_namedtuple():
     # Example NamedTuple
     data = MockPerson('Alice', MockAge(25, np.asarray(6)))
@@ -80,3 +86,33 @@ def test_to_json():
     restored_data = deserialise_namedtuple(json.loads(s))
     print(restored_data)
     assert data == restored_data
+
+
+def test_serialise_ndarray():
+    for x in [np.array(6), np.arange(12, dtype=np.float32).reshape((3, 4)), np.asarray([True, False]),
+              np.zeros((0, 2)), np.asarray(['a', 'bc'])]:
+        s = json.dumps(serialise_ndarray(x))
+        restored = deserialise_ndarray(json.loads(s))
+        assert restored.dtype == x.dtype
+        assert restored.shape == x.shape
+        np.testing.assert_array_equal(restored, x)
+
+    # Legacy list format still loads
+    legacy = {'type': '__ndarray__', '__dtype__': 'float64', '__data__': [[1., 2.], [3., 4.]]}
+    np.testing.assert_array_equal(deserialise_ndarray(legacy), np.asarray([[1., 2.], [3., 4.]]))
+
+
+def test_serialise_deep_namedtuple():
+    # Deeper than the recursion limit
+    data = MockNode(0, [])
+    for i in range(1, 5000):
+        data = MockNode(i, [data, {'x': np.arange(3), 'y': (i, 'a')}])
+    restored_data = deserialise_namedtuple(serialise_namedtuple(data))
+    node = restored_data
+    for i in reversed(range(1, 5000)):
+        assert node.value == i
+        assert list(node.children[1].keys()) == ['x', 'y']
+        np.testing.assert_array_equal(node.children[1]['x'], np.arange(3))
+        assert node.children[1]['y'] == [i, 'a']
+        node = node.children[0]
+    assert node == MockNode(0, [])
@@ -38,5 +38,5 @@ setup(name='jaxns',
           "License :: OSI Approved :: Apache Software License",
           "Operating System :: OS Independent",
       ],
-      python_requires='>=3.9',
+      python_requires='>=3.10',
       )